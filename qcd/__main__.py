@@ -4,6 +4,7 @@ from datetime import datetime
 from xml.etree import ElementTree
 
 import plac
+from lxml import etree
 
 from qcd.concept_graph import ConceptGraph
 from qcd.xml_parser import XMLParser, OpenIEParser, CoreNLPParser, EnsembleParser
@@ -67,7 +68,7 @@ def main(file, parser_type='default', disable_coreference_resolution=False, disa
         delta = datetime.now() - start
 
         print('Document parsed in: %s' % delta)
-    except ElementTree.ParseError as e:
+    except (ElementTree.ParseError, etree.XMLSyntaxError) as e:
         print('Could not parse the file. \n%s.' % e.msg.capitalize(), file=sys.stderr)
         exit(1)
     except FileNotFoundError as e:
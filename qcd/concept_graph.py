@@ -1,11 +1,17 @@
 """This file implements two main components: a 'concept graph' and a parser for building up a concept graph."""
 
-from collections import defaultdict
+import concurrent.futures
+import functools
+import os
+import subprocess
+import sys
+import webbrowser
+from collections import defaultdict, namedtuple
 from math import log2
 from typing import Type, Set, Dict, Optional, List, Tuple, NewType, Union
 
-import graphviz
 import networkx as nx
+import numpy as np
 from wordfreq import zipf_frequency
 
 from qcd.graph import Node, DirectedEdgeI, GraphI, Section
@@ -27,7 +33,9 @@ class DirectedEdge(DirectedEdgeI):
         self._tail: Node = tail
         self._head: Node = head
         self.weight: float = weight
-        self.frequency: int = 1  # the number of the times this edge occurs
+        self._frequency: int = 1  # the number of the times this edge occurs
+        # Cached value of `log_weighted_frequency`, invalidated whenever the frequency changes.
+        self._log_weighted_frequency: Optional[float] = None
 
         self._colour: str = 'black'
         self._style: str = 'solid'
@@ -37,7 +45,9 @@ class DirectedEdge(DirectedEdgeI):
         return self._tail == other._tail and self._head == other._head
 
     def __hash__(self):
-        return hash(self._tail + self._head)
+        # Hashing a tuple avoids both the string concatenation and collisions between edges
+        # such as ('ab', 'c') and ('a', 'bc').
+        return hash((self._tail, self._head))
 
     def __str__(self):
         class_ = self.__class__.__name__
@@ -82,6 +92,16 @@ class DirectedEdge(DirectedEdgeI):
     def label(self, value: str):
         self._label = value
 
+    @property
+    def frequency(self) -> int:
+        """The number of the times this edge occurs."""
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self, value: int):
+        self._frequency = value
+        self._log_weighted_frequency = None
+
     @property
     def weighted_frequency(self):
         """The weighted frequency of the edge."""
@@ -99,19 +119,75 @@ class DirectedEdge(DirectedEdgeI):
         # > Add one to log argument so that the return value is strictly
         # non-negative, weight=0 gives a return value of 0 and avoids
         # log(0) which is undefined.
-        return 1 + log2(1 + self.weighted_frequency)
+        # The value only changes when the frequency does, so it is computed
+        # once and cached until then.
+        if self._log_weighted_frequency is None:
+            self._log_weighted_frequency = 1 + log2(1 + self.weighted_frequency)
+
+        return self._log_weighted_frequency
 
-    def render(self, g: graphviz.Digraph, colour: Optional[str] = None):
-        """Render/draw the edge using GraphViz.
+    def to_dot(self, colour: Optional[str] = None) -> str:
+        """Get the DOT statement that renders/draws the edge.
 
-        :param g: The graphviz graph instance.
         :param colour: The colour to render the edge. If None then the edge's colour attribute is used.
+        :return: The DOT statement for the edge.
         """
-        g.edge(self._tail, self._head,
-               penwidth=str(self.log_weighted_frequency),
-               color=colour if colour else self.colour,
-               style=self.style,
-               label=self.label)
+        return '"%s" -> "%s" [penwidth="%s" color="%s" style="%s" label="%s"];' % (
+            _dot_escape(self._tail), _dot_escape(self._head), self.log_weighted_frequency,
+            colour if colour else self.colour, self.style, _dot_escape(self.label))
+
+
+def _dot_escape(value: str) -> str:
+    """Escape a string for use inside a double-quoted DOT identifier.
+
+    :param value: The string to escape.
+    :return: The escaped string.
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+# A compressed sparse row (CSR) view of a graph using integer node ids. The successors of the node with id `i`
+# are `indices[indptr[i]:indptr[i + 1]]` and its predecessors are `rindices[rindptr[i]:rindptr[i + 1]]`.
+# Traversing contiguous integer arrays is much more cache friendly than hopping between Python sets.
+CSRGraph = namedtuple('CSRGraph', ['nodes', 'node_index', 'indptr', 'indices', 'rindptr', 'rindices',
+                                   'out_degrees', 'out_weights', 'section_ids'])
+
+
+def _find_component_cycles(component: 'nx.DiGraph') -> List[List['Node']]:
+    """Find the simple cycles within a single weakly connected component.
+
+    This is a module level function so that it can be pickled and dispatched to worker processes.
+
+    :param component: The subgraph induced by the component's nodes.
+    :return: A list of the cycles found in the component.
+    """
+    return list(nx.simple_cycles(component))
+
+
+@functools.lru_cache(maxsize=100000)
+def word_frequency(phrase: str) -> float:
+    """Look up the Zipf-scale frequency of a phrase, caching the result.
+
+    The same node names are looked up every time concepts are categorised, and wordfreq's lookup involves
+    tokenisation and smoothing that is worth skipping on repeats.
+
+    :param phrase: The phrase to look up.
+    :return: The Zipf-scale frequency of the phrase in English.
+    """
+    return zipf_frequency(phrase, 'en')
+
+
+@functools.lru_cache(maxsize=100000)
+def _tokens(phrase: str) -> Tuple[str, ...]:
+    """Split a phrase into its tokens, caching the result.
+
+    Node names are split repeatedly during post-processing and the same names recur across documents, so
+    memoising the splits avoids re-allocating the same token lists.
+
+    :param phrase: The phrase to split.
+    :return: The tokens of the phrase.
+    """
+    return tuple(phrase.split(' '))
 
 
 Relation = NewType('Relation', str)
@@ -140,7 +216,7 @@ class RelationalEdge(DirectedEdge):
             return super(RelationalEdge, self).__eq__(other)
 
     def __hash__(self):
-        return hash(self._tail + self._head + self.relation)
+        return hash((self._tail, self._head, self.relation))
 
     def __str__(self):
         class_ = self.__class__.__name__
@@ -196,8 +272,14 @@ class ConceptGraph(GraphI):
         self.section_nodes: Set[Node] = set()
         # List of sections used to record order that sections are introduced.
         self.sections: List[Section] = list()
+        # Maps each section to its position in `sections` for constant time rank lookups.
+        self._section_rank: Dict[Section, int] = dict()
         # Maps nodes to the frequency they appear in each section.
         self.node_frequency_by_section: Dict[Node, Dict[Section, int]] = defaultdict(lambda: defaultdict(int))
+        # The section each node appears in most often and that section's count, maintained incrementally so
+        # that section reassignment does not have to rescan the per-section counts.
+        self._best_section: Dict[Node, Section] = dict()
+        self._best_section_count: Dict[Node, int] = dict()
 
         # Maps tail to head nodes
         self.adjacency_list: Dict[Node, Set[Node]] = defaultdict(set)
@@ -207,6 +289,13 @@ class ConceptGraph(GraphI):
         self.edges: Set[DirectedEdge] = set()
         # Maps (tail, head) pairs to edge instance
         self.edge_index: Dict[Tuple[Node, Node], Optional[DirectedEdge]] = defaultdict(lambda: None)
+        # Edge weights mirrored into a flat array so that aggregate statistics can be computed with vectorised
+        # NumPy operations instead of Python-level loops over the edge set.
+        self._edge_weights: np.ndarray = np.zeros(64)
+        # Maps (tail, head) pairs to a slot in `_edge_weights`.
+        self._edge_slots: Dict[Tuple[Node, Node], int] = dict()
+        # The number of slots in `_edge_weights` that are in use.
+        self._n_edge_slots: int = 0
 
         # Set of forward references
         self.forward_references: Set[DirectedEdge] = set()
@@ -227,45 +316,97 @@ class ConceptGraph(GraphI):
 
         # Misc #
         self.nx: Optional[nx.DiGraph] = None
+        # The CSR view of the graph, built lazily and discarded whenever the graph changes.
+        self._csr: Optional[CSRGraph] = None
 
     @property
     def mean_outdegree(self):
-        return sum([len(self.adjacency_list[node]) for node in self.nodes]) / len(self.nodes)
+        return self._csr_graph().out_degrees.sum() / len(self.nodes)
 
     @property
     def mean_section_outdegree(self):
-        avg_degree = 0
+        csr = self._csr_graph()
 
-        for section in self.sections:
-            avg_degree += sum(
-                [len(self.adjacency_list[node]) for node in self.section_listings[section]]) / len(
-                self.section_listings[section])
+        section_degrees = np.zeros(len(self.sections))
+        np.add.at(section_degrees, csr.section_ids, csr.out_degrees)
 
-        avg_degree /= len(self.sections)
-
-        return avg_degree
+        return (section_degrees / self._section_sizes()).mean()
 
     @property
     def mean_weighted_outdegree(self):
-        return sum([edge.weight for edge in self.edges]) / len(self.nodes)
+        return self._edge_weights[:self._n_edge_slots].sum() / len(self.nodes)
 
     @property
     def mean_weighted_section_outdegree(self):
-        avg_degree = 0
+        csr = self._csr_graph()
+
+        section_degrees = np.zeros(len(self.sections))
+        np.add.at(section_degrees, csr.section_ids, csr.out_weights)
+
+        return (section_degrees / self._section_sizes()).mean()
 
-        for section in self.sections:
-            section_degree = 0
+    def _csr_graph(self) -> CSRGraph:
+        """Get the CSR view of the graph, rebuilding it if the graph has changed since it was last built.
 
-            for tail in self.section_listings[section]:
-                for head in self.adjacency_list[tail]:
-                    section_degree += self.get_edge(tail, head).weight
+        :return: The CSR view of the graph.
+        """
+        if self._csr is None:
+            self._csr = self._build_csr()
+
+        return self._csr
 
-            section_degree /= len(self.section_listings[section])
-            avg_degree += section_degree
+    def _build_csr(self) -> CSRGraph:
+        """Build the CSR view of the graph.
 
-        avg_degree /= len(self.sections)
+        Nodes are assigned integer ids and the adjacency sets are flattened into contiguous index arrays,
+        together with each node's outgoing degree, total outgoing edge weight and section rank.
 
-        return avg_degree
+        :return: The CSR view of the graph.
+        """
+        nodes = list(self.nodes)
+        node_index = {node: i for i, node in enumerate(nodes)}
+        section_rank = {section: i for i, section in enumerate(self.sections)}
+        n = len(nodes)
+
+        out_degrees = np.fromiter((len(self.adjacency_list[node]) for node in nodes), dtype=np.int32, count=n)
+        in_degrees = np.fromiter((len(self.adjacency_index[node]) for node in nodes), dtype=np.int32, count=n)
+
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(out_degrees, out=indptr[1:])
+        rindptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(in_degrees, out=rindptr[1:])
+
+        indices = np.empty(indptr[-1] if n > 0 else 0, dtype=np.int32)
+        rindices = np.empty(rindptr[-1] if n > 0 else 0, dtype=np.int32)
+        out_weights = np.zeros(n)
+
+        pos = 0
+
+        for i, node in enumerate(nodes):
+            for head in self.adjacency_list[node]:
+                indices[pos] = node_index[head]
+                out_weights[i] += self.get_edge(node, head).weight
+                pos += 1
+
+        pos = 0
+
+        for i, node in enumerate(nodes):
+            for tail in self.adjacency_index[node]:
+                rindices[pos] = node_index[tail]
+                pos += 1
+
+        section_ids = np.fromiter((section_rank[self.section_index[node]] for node in nodes),
+                                  dtype=np.int32, count=n)
+
+        return CSRGraph(nodes, node_index, indptr, indices, rindptr, rindices,
+                        out_degrees, out_weights, section_ids)
+
+    def _section_sizes(self) -> np.ndarray:
+        """
+        :return: An array containing the number of nodes in each section, ordered as in `sections`.
+        """
+        return np.fromiter((len(self.section_listings[section]) for section in self.sections),
+                           dtype=np.int64, count=len(self.sections))
 
     @property
     def mean_cycle_length(self):
@@ -290,9 +431,14 @@ class ConceptGraph(GraphI):
         if node == '':
             return
 
+        # Node and section names are interned so that the many dict and set probes on them below (and in
+        # post-processing) compare by pointer in the common case instead of hashing the full string.
+        node = sys.intern(node)
+        section = sys.intern(section)
+
         # Main section node was referenced before but now is being added under its own section,
         # update the relevant section details.
-        elif node in self.nodes and node == section:
+        if node in self.nodes and node == section:
             self.section_listings[self.section_index[node]].remove(node)
             self.section_index[node] = section
             self.section_listings[section].add(node)
@@ -304,11 +450,13 @@ class ConceptGraph(GraphI):
 
             if section not in self.sections:
                 self.sections.append(section)
+                self._section_rank[section] = len(self.sections) - 1
 
             if node == section:
                 self.section_nodes.add(node)
 
         self.update_section_count(node, section)
+        self._csr = None
 
     def add_edge(self, tail: Node = None, head: Node = None, edge_type: Type[DirectedEdge] = DirectedEdge,
                  edge: DirectedEdge = None, allow_self_reference: bool = False) -> Optional[DirectedEdge]:
@@ -325,36 +473,72 @@ class ConceptGraph(GraphI):
             assert tail is not None and head is not None, \
                 'The parameters `head` and `tail` must both be set if no edge instance is given.'
 
-            # Get edge if it exists in the graph already...
+            if tail == '' or head == '':
+                return None
+
+            if not allow_self_reference and tail == head:
+                return None
+
+            tail = sys.intern(tail)
+            head = sys.intern(head)
+
+            # Duplicate edges only increase a count and each unique edge is
+            # only rendered once. A new edge instance is only allocated on the
+            # miss path below.
             edge = self.get_edge(tail, head)
 
-            # Otherwise create a new edge instance
-            if edge is None:
-                edge = edge_type(tail, head)
+            if edge is not None:
+                edge.frequency += 1
+
+                return edge
+
+            edge = edge_type(tail, head)
         else:
             tail = edge.tail
             head = edge.head
 
-        if tail == '' or head == '':
-            return None
+            if tail == '' or head == '':
+                return None
 
-        assert tail in self.nodes and head in self.nodes, 'Both nodes in the edge must exist within the graph.'
+            if not allow_self_reference and tail == head:
+                return None
 
-        if not allow_self_reference and tail == head:
-            return None
+            if edge in self.edges:
+                edge.frequency += 1
 
-        if edge in self.edges:
-            # Duplicate edges only increase a count and each unique edge is
-            # only rendered once.
-            edge.frequency += 1
-        else:
-            self.adjacency_list[tail].add(head)
-            self.adjacency_index[head].add(tail)
-            self.edges.add(edge)
-            self.edge_index[(tail, head)] = edge
+                return edge
+
+        assert tail in self.nodes and head in self.nodes, 'Both nodes in the edge must exist within the graph.'
+
+        self.adjacency_list[tail].add(head)
+        self.adjacency_index[head].add(tail)
+        self.edges.add(edge)
+        self.edge_index[(tail, head)] = edge
+        self._set_edge_weight(tail, head, edge.weight)
+        self._csr = None
 
         return edge
 
+    def _set_edge_weight(self, tail: Node, head: Node, weight: float):
+        """Mirror an edge's weight into the flat weight array used for the vectorised statistics.
+
+        :param tail: The tail node of the edge.
+        :param head: The head node of the edge.
+        :param weight: The weight of the edge.
+        """
+        slot = self._edge_slots.get((tail, head))
+
+        if slot is None:
+            # Grow the array geometrically so that assigning a new slot is amortised O(1).
+            if self._n_edge_slots == len(self._edge_weights):
+                self._edge_weights = np.resize(self._edge_weights, 2 * len(self._edge_weights))
+
+            slot = self._n_edge_slots
+            self._n_edge_slots += 1
+            self._edge_slots[(tail, head)] = slot
+
+        self._edge_weights[slot] = weight
+
     def add_relation(self, subject: Node, relation: Relation, object_: Node, section: Section):
         """Add a relation between two concepts to the graph.
         This is shorthand for adding the both of the concepts as nodes and adding an edge between those nodes.
@@ -377,21 +561,34 @@ class ConceptGraph(GraphI):
         :param edge: The edge object to remove. The parameters `tail` and `head`
                      are ignored if this parameter is not `None`.
         """
-        try:
-            if not edge:
-                assert tail is not None and head is not None, \
-                    'The parameters `head` and `tail` must both be set if no edge instance is given.'
-
-                edge = self.edge_index[(tail, head)]
+        if edge is not None:
+            # Only the tail and head are taken from the given edge. The instance that is removed is
+            # always the graph's own, since `edge` may be of a different edge type whose hash does not
+            # match the stored instance's.
+            tail = edge.tail
+            head = edge.head
+        else:
+            assert tail is not None and head is not None, \
+                'The parameters `head` and `tail` must both be set if no edge instance is given.'
 
-            self.edges.discard(edge)
-            del self.edge_index[(tail, head)]
+        edge = self.edge_index.pop((tail, head), None)
 
-            self.adjacency_list[tail].discard(head)
-            self.adjacency_index[head].discard(tail)
-        except KeyError:
+        if edge is None:
             # non-existent edge, probably
-            pass
+            return
+
+        self.edges.discard(edge)
+
+        self.adjacency_list[tail].discard(head)
+        self.adjacency_index[head].discard(tail)
+
+        # The slot is kept so that re-adding the edge (e.g. via `set_edge`) reuses it.
+        slot = self._edge_slots.get((tail, head))
+
+        if slot is not None:
+            self._edge_weights[slot] = 0.0
+
+        self._csr = None
 
     def get_edge(self, tail: Node, head: Node) -> DirectedEdge:
         """Get the edge that connects the nodes corresponding to `tail` and `head`.
@@ -400,7 +597,7 @@ class ConceptGraph(GraphI):
         :param head: The name of the node that the edge points to.
         :return: The corresponding edge if it exists in the graph, None otherwise.
         """
-        return self.edge_index[(tail, head)]
+        return self.edge_index.get((tail, head))
 
     def set_edge(self, edge: DirectedEdge) -> DirectedEdge:
         """Set (delete and add) an edge in the graph.
@@ -421,18 +618,29 @@ class ConceptGraph(GraphI):
         :param node: The node.
         :param section: The section the node was found in.
         """
-        self.node_frequency_by_section[node][section] += 1
+        count = self.node_frequency_by_section[node][section] + 1
+        self.node_frequency_by_section[node][section] = count
+
+        if count > self._best_section_count.get(node, 0):
+            self._best_section[node] = section
+            self._best_section_count[node] = count
 
-    def parse(self, filename: str):
+    def parse(self, document):
         """Parse a XML document and build up a graph structure.
 
-        :param filename: The XML file to parse.
+        :param document: The XML file to parse, or its pre-loaded sections.
         """
-        self.parser.parse(filename, self)
+        self.parser.parse(document, self)
         self.postprocessing()
 
     def postprocessing(self):
         """Perform tasks to fix/normalise the graph structure"""
+        # Freeze the defaultdicts that were convenient while parsing. A stray lookup of a missing key during
+        # post-processing would otherwise silently insert a default entry, growing the dicts mid-traversal.
+        self.section_index = dict(self.section_index)
+        self.node_frequency_by_section = {node: dict(counts) for node, counts in self.node_frequency_by_section.items()}
+        self.edge_index = dict(self.edge_index)
+
         self._reassign_implicit_entities()
         self._reassign_sections()
         self._categorise_nodes()
@@ -447,9 +655,10 @@ class ConceptGraph(GraphI):
 
         :return: The graph as an NetworkX graph.
         """
-        g = nx.DiGraph()
-        g.add_nodes_from([node for node in self.nodes])
-        g.add_edges_from([(edge.tail, edge.head) for edge in self.edges])
+        # Constructing the graph from the adjacency dict directly uses NetworkX's bulk constructor
+        # path instead of dispatching once per edge.
+        g = nx.DiGraph(self.adjacency_list)
+        g.add_nodes_from(self.nodes)
 
         return g
 
@@ -478,6 +687,7 @@ class ConceptGraph(GraphI):
 
                     self.section_listings[node_section].add(child)
                     self.section_index[child] = node_section
+                    self._csr = None
 
     def _reassign_sections(self):
         """Reassign nodes to another section if the node appears more times in that section."""
@@ -486,13 +696,13 @@ class ConceptGraph(GraphI):
                 continue
 
             prev_section = self.section_index[node]
-            new_section = max(self.node_frequency_by_section[node],
-                              key=lambda key: self.node_frequency_by_section[node][key])
+            new_section = self._best_section[node]
 
             if new_section != prev_section:
                 self.section_listings[prev_section].remove(node)
                 self.section_index[node] = new_section
                 self.section_listings[new_section].add(node)
+                self._csr = None
 
     def _categorise_nodes(self, graph_based=True):
         """Categorise nodes in the graph into 'a priori' and 'emerging' concepts.
@@ -503,41 +713,37 @@ class ConceptGraph(GraphI):
         :param graph_based: Flag indicating whether or not to use the graph-based classification method.
         """
         if graph_based:
+            csr = self._csr_graph()
+
             for section in self.sections:
                 for node in self.section_listings[section]:
                     # Skip concepts that have already been categorised during parsing.
                     if node in self.emerging_concepts:
                         continue
 
-                    referencing_sections = set()
-
-                    for tail in self.adjacency_index[node]:
-                        tail_section = self.section_index[tail]
-                        referencing_sections.add(tail_section)
+                    i = csr.node_index[node]
+                    # The test only cares whether the referencing sections are all the same, so comparing
+                    # against the first id avoids the sort that np.unique would do.
+                    referencing_sections = csr.section_ids[csr.rindices[csr.rindptr[i]:csr.rindptr[i + 1]]]
+                    multiple_sections = referencing_sections.size > 1 \
+                        and (referencing_sections != referencing_sections[0]).any()
 
-                    if len(referencing_sections) > 1 and zipf_frequency(node,
-                                                                        'en') < self.emerging_concept_frequency_cutoff:
+                    if multiple_sections and word_frequency(node) < self.emerging_concept_frequency_cutoff:
                         self.emerging_concepts.add(node)
                     else:
                         self.a_priori_concepts.add(node)
 
         # Enforce transitivity of concept labels such that all concepts that contain an emerging concept as a
-        # constituent are also labelled as emerging concepts.
-        for node in self.nodes:
-            found = False
-
-            for token in node.split(' '):
-                for other in self.emerging_concepts:
-                    if token in other.split(' '):
-                        self.a_priori_concepts.discard(node)
-                        self.emerging_concepts.add(node)
-                        found = True
+        # constituent are also labelled as emerging concepts. Indexing the emerging concepts' tokens up front
+        # turns the scan over all emerging concepts per node token into a single set lookup.
+        emerging_tokens = {token for other in self.emerging_concepts for token in _tokens(other)}
 
-                    if found:
-                        break
+        for node in self.nodes:
+            found = any(token in emerging_tokens for token in _tokens(node))
 
-                if found:
-                    break
+            if found:
+                self.a_priori_concepts.discard(node)
+                self.emerging_concepts.add(node)
 
             # Need to add a priori concepts here if we are not using the graph-based classifier
             # (i.e. we are using the rule-based classifier)
@@ -547,16 +753,20 @@ class ConceptGraph(GraphI):
     def _add_self_references(self):
         """Add edges to the graph for emerging concepts that reference themselves from different sections."""
         for node in self.emerging_concepts:
-            section_i = self.sections.index(self.section_index[node])
+            section_i = self._section_rank[self.section_index[node]]
 
-            for section in self.sections:
-                if self.node_frequency_by_section[node][section] > 0:
-                    # TODO: If reference is already in the graph, then update the frequency of the edge by
-                    #  `self.node_frequency_by_section[node][section]`.
-                    if self.sections.index(section) < section_i:
-                        self.add_edge(node, node, ForwardReference, allow_self_reference=True)
-                    elif self.sections.index(section) > section_i:
-                        self.add_edge(node, node, BackwardReference, allow_self_reference=True)
+            # Only the sections the node actually appears in are visited, rather than scanning every section
+            # for a non-zero count. The counts are recorded in document order, so the edges are added in the
+            # same order as before.
+            for section in self.node_frequency_by_section[node]:
+                # TODO: If reference is already in the graph, then update the frequency of the edge by
+                #  `self.node_frequency_by_section[node][section]`.
+                rank = self._section_rank[section]
+
+                if rank < section_i:
+                    self.add_edge(node, node, ForwardReference, allow_self_reference=True)
+                elif rank > section_i:
+                    self.add_edge(node, node, BackwardReference, allow_self_reference=True)
 
     def mark_edges(self):
         """Colour edges as either forward or backward edges."""
@@ -564,36 +774,41 @@ class ConceptGraph(GraphI):
         self.backward_references = set()
 
         visited = set()
-
+        # Section ranks are looked up once per traversed edge, so precompute them instead of calling
+        # the linear time `list.index` inside the traversal. The ranks are rebuilt here since `sections`
+        # may have been reordered since parsing (e.g. by the section ordering experiments), and the CSR
+        # view is discarded for the same reason -- its section ids were derived from the old ordering.
+        self._section_rank = {section: i for i, section in enumerate(self.sections)}
+        section_rank = self._section_rank
+        self._csr = None
+
+        # The depth-first traversal uses an explicit stack of (curr, prev) pairs to avoid Python's
+        # function call overhead and recursion limit.
         for node in self.nodes:
-            self._mark_edges_helper(node, None, visited)
+            stack = [(node, None)]
 
-        self._add_self_references()
+            while stack:
+                curr, prev = stack.pop()
 
-    def _mark_edges_helper(self, curr: Node, prev: Optional[Node], visited: set):
-        """Recursively mark edges.
+                # We have reached a 'leaf node' which is a node belonging to another section
+                if prev and self.section_index[curr] != self.section_index[prev] and curr in self.emerging_concepts:
+                    # Check if the path goes forward from section to a later section, or vice versa
+                    curr_i = section_rank[self.section_index[curr]]
+                    prev_i = section_rank[self.section_index[prev]]
 
-        :param curr: The next node to vist.
-        :param prev: The node that was previously visited.
-        :param visited: The set of nodes that have already been visited.
-        """
-        # We have reached a 'leaf node' which is a node belonging to another section
-        if prev and self.section_index[curr] != self.section_index[prev] and curr in self.emerging_concepts:
-            # Check if the path goes forward from section to a later section, or vice versa
-            curr_i = self.sections.index(self.section_index[curr])
-            prev_i = self.sections.index(self.section_index[prev])
+                    if curr_i < prev_i:
+                        self._mark_edge(prev, curr, BackwardReference)
+                    elif curr_i > prev_i:
+                        self._mark_edge(prev, curr, ForwardReference)
 
-            if curr_i < prev_i:
-                self._mark_edge(prev, curr, BackwardReference)
-            elif curr_i > prev_i:
-                self._mark_edge(prev, curr, ForwardReference)
+                if curr not in visited:
+                    # Otherwise we continue the depth-first traversal
+                    visited.add(curr)
 
-        if curr not in visited:
-            # Otherwise we continue the depth-first traversal
-            visited.add(curr)
+                    for child in self.adjacency_list[curr]:
+                        stack.append((child, curr))
 
-            for child in self.adjacency_list[curr]:
-                self._mark_edges_helper(child, curr, visited)
+        self._add_self_references()
 
     def _mark_edge(self, tail: Node, head: Node, edge_type: Type[DirectedEdge] = DirectedEdge):
         """Mark an edge.
@@ -619,8 +834,26 @@ class ConceptGraph(GraphI):
             self.backward_references.add(new_edge)
 
     def find_cycles(self) -> List[List[Node]]:
-        """Find cycles in the graph."""
-        self.cycles = [cycle for cycle in nx.simple_cycles(self.nx)]
+        """Find cycles in the graph.
+
+        Cycles cannot span weakly connected components, so each component is searched independently
+        and components are dispatched to worker processes when there is more than one to search.
+        """
+        self.cycles = []
+
+        components = []
+
+        for nodes in nx.weakly_connected_components(self.nx):
+            # Single nodes can only be part of a cycle if they reference themselves.
+            if len(nodes) > 1 or self.nx.has_edge(next(iter(nodes)), next(iter(nodes))):
+                components.append(self.nx.subgraph(nodes).copy())
+
+        if len(components) == 1:
+            self.cycles = _find_component_cycles(components[0])
+        elif len(components) > 1:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                for cycles in executor.map(_find_component_cycles, components):
+                    self.cycles += cycles
 
         return self.cycles
 
@@ -629,7 +862,38 @@ class ConceptGraph(GraphI):
 
         :return: A list of the subgraphs.
         """
-        self.subgraphs = [nodes for nodes in nx.connected_components(self.nx.to_undirected())]
+        # Union-find over the CSR integer ids: each edge unions its endpoints and the surviving roots
+        # identify the weakly connected components. Node names are only translated back at the end.
+        csr = self._csr_graph()
+        n = len(csr.nodes)
+        parent = list(range(n))
+
+        def find(i: int) -> int:
+            root = i
+
+            while parent[root] != root:
+                root = parent[root]
+
+            # Path compression: point everything on the walked path directly at the root.
+            while parent[i] != root:
+                parent[i], i = root, parent[i]
+
+            return root
+
+        for i in range(n):
+            for j in csr.indices[csr.indptr[i]:csr.indptr[i + 1]]:
+                root_i = find(i)
+                root_j = find(j)
+
+                if root_i != root_j:
+                    parent[root_j] = root_i
+
+        components = defaultdict(set)
+
+        for i, node in enumerate(csr.nodes):
+            components[find(i)].add(node)
+
+        self.subgraphs = list(components.values())
 
         return self.subgraphs
 
@@ -681,20 +945,24 @@ class ConceptGraph(GraphI):
         :param filename: The name of the file to save the output to.
         :param view: Whether or not to show the output in a window.
         """
-        try:
-            g = graphviz.Digraph(engine='neato')
-            g.attr(overlap='false')
+        # The DOT source is emitted directly and piped to GraphViz in one go, skipping the per-node and
+        # per-edge method dispatch of the graphviz library wrapper.
+        lines = ['digraph {', 'overlap=false;']
+        lines.extend('"%s";' % _dot_escape(node) for node in self.nodes)
 
-            for node in self.nodes:
-                g.node(node)
+        if self.mark_references:
+            lines.extend(edge.to_dot() for edge in self.edges)
+        else:
+            lines.extend(edge.to_dot(colour='black') for edge in self.edges)
 
-            if self.mark_references:
-                for edge in self.edges:
-                    edge.render(g)
-            else:
-                for edge in self.edges:
-                    edge.render(g, colour='black')
+        lines.append('}')
+        source = '\n'.join(lines)
 
-            g.render(filename, format='png', view=view, cleanup=True)
-        except graphviz.backend.ExecutableNotFound:
+        try:
+            subprocess.run(['neato', '-Tpng', '-o', filename + '.png'], input=source.encode('utf-8'), check=True)
+        except FileNotFoundError:
             print('Could not display graph -- GraphViz does not seem to be installed.')
+            return
+
+        if view:
+            webbrowser.open('file://' + os.path.abspath(filename + '.png'))
@@ -1,15 +1,16 @@
+import concurrent.futures
 import os
 import random
 from typing import Optional
 from typing import Tuple
-from xml.etree import ElementTree as ET
 
 import pandas as pd
 import plac
 import spacy
+from lxml import etree
 
 from qcd.concept_graph import ConceptGraph, DirectedEdge
-from qcd.xml_parser import XMLParser, CoreNLPParser, OpenIEParser, EnsembleParser
+from qcd.xml_parser import XMLParser, CoreNLPParser, OpenIEParser, EnsembleParser, load_sections
 
 
 # noinspection PyStringFormat
@@ -30,28 +31,40 @@ def evaluate(graph, a_priori_concepts, emerging_concepts, forward_references, ba
     graph_forward_references = {edge.head for edge in graph.forward_references}
     graph_backward_references = {edge.head for edge in graph.backward_references}
 
-    concepts_precision, concepts_recall, concepts_f1 = \
-        precision_recall_f1(a_priori_concepts.union(emerging_concepts),
-                            graph.a_priori_concepts.union(graph.emerging_concepts))
+    # The combined target and prediction sets are built once up front rather than once per use.
+    all_concepts = a_priori_concepts | emerging_concepts
+    all_graph_concepts = graph.a_priori_concepts | graph.emerging_concepts
+    all_references = forward_references | backward_references
+    all_graph_references = graph_forward_references | graph_backward_references
+
+    a_priori_metrics = precision_recall_f1(a_priori_concepts, graph.a_priori_concepts)
+    emerging_metrics = precision_recall_f1(emerging_concepts, graph.emerging_concepts)
+    concepts_precision, concepts_recall, concepts_f1 = precision_recall_f1(all_concepts, all_graph_concepts)
 
     # TODO: Fix NaNs in precision for forward references in some documents
     #  (e.g. bread_annotations.xml, closures_annotations.xml)
+    forward_metrics = precision_recall_f1(forward_references, graph_forward_references)
+    backward_metrics = precision_recall_f1(backward_references, graph_backward_references)
     references_precision, references_recall, references_f1 = \
-        precision_recall_f1(forward_references.union(backward_references),
-                            graph_forward_references.union(graph_backward_references))
-    results = {
-        'A Priori Concepts': [*precision_recall_f1(a_priori_concepts, graph.a_priori_concepts)],
-        'Emerging Concepts': [*precision_recall_f1(emerging_concepts, graph.emerging_concepts)],
-        'Concepts Overall': [concepts_precision, concepts_recall, concepts_f1],
-        'Forward References': [*precision_recall_f1(forward_references, graph_forward_references)],
-        'Backward References': [*precision_recall_f1(backward_references, graph_backward_references)],
-        'References Overall': [references_precision, references_recall, references_f1],
-        'Overall Average': [0.5 * (concepts_precision + references_precision),
-                            0.5 * (concepts_recall + references_recall),
-                            0.5 * (concepts_f1 + references_f1)],
-    }
-
-    metrics_df = pd.DataFrame.from_dict(results, orient='index', columns=['precision', 'recall', 'f1'])
+        precision_recall_f1(all_references, all_graph_references)
+
+    rows = [
+        a_priori_metrics,
+        emerging_metrics,
+        (concepts_precision, concepts_recall, concepts_f1),
+        forward_metrics,
+        backward_metrics,
+        (references_precision, references_recall, references_f1),
+        (0.5 * (concepts_precision + references_precision),
+         0.5 * (concepts_recall + references_recall),
+         0.5 * (concepts_f1 + references_f1)),
+    ]
+
+    metrics_df = pd.DataFrame(rows,
+                              index=['A Priori Concepts', 'Emerging Concepts', 'Concepts Overall',
+                                     'Forward References', 'Backward References', 'References Overall',
+                                     'Overall Average'],
+                              columns=['precision', 'recall', 'f1'])
 
     return metrics_df
 
@@ -62,56 +75,64 @@ def precision_recall_f1(target: set, prediction: set) -> Tuple[float, float, flo
     :param prediction: The predicted set.
     :return: A 3-tuple containing the precision, recall and f1-score.
     """
-    try:
-        precision = len(target.intersection(prediction)) / len(prediction)
-    except ZeroDivisionError:
-        precision = float('nan')
-
-    try:
-        recall = len(target.intersection(prediction)) / len(target)
-    except ZeroDivisionError:
-        recall = float('nan')
-
-    try:
-        f1 = 2 * ((precision * recall) / (precision + recall))
-    except ZeroDivisionError:
-        f1 = float('nan')
+    # The three metrics are computed directly from the true/false positive and false negative counts,
+    # so each is a single integer division. The false counts follow from the set sizes and the one
+    # intersection, so no difference sets are materialised.
+    true_positives = len(target.intersection(prediction))
+    false_positives = len(prediction) - true_positives
+    false_negatives = len(target) - true_positives
+
+    precision = true_positives / (true_positives + false_positives) \
+        if true_positives + false_positives > 0 else float('nan')
+    recall = true_positives / (true_positives + false_negatives) \
+        if true_positives + false_negatives > 0 else float('nan')
+    f1 = 2 * true_positives / (2 * true_positives + false_positives + false_negatives) \
+        if 2 * true_positives + false_positives + false_negatives > 0 else float('nan')
 
     return precision, recall, f1
 
 
 def extract_annotations_from_file(filename):
-    with open(filename, 'r') as f:
-        tree = ET.parse(f)
-
-    root = tree.getroot()
-
     a_priori_concepts = set()
     emerging_concepts = set()
     forward_references = set()
     backward_references = set()
-    nlp = spacy.load('en')
 
-    for section in root.findall('section'):
+    tagged_annotations = []
+
+    # Stream the document section by section rather than materialising the whole tree, freeing each
+    # section element once its annotations have been read.
+    for _, section in etree.iterparse(filename, events=('end',), tag='section'):
         annotations = section.find('annotations')
 
-        if annotations:
+        if annotations is not None and len(annotations):
             for annotation in annotations:
-                tag = annotation.get('tag')
-                tag = tag.lower()
-
-                concept = annotation.text.lower()
-                concept = nlp(concept)
-                concept = ' '.join([token.lemma_ for token in concept])
-
-                if tag == 'a priori':
-                    a_priori_concepts.add(concept)
-                elif tag == 'emerging':
-                    emerging_concepts.add(concept)
-                elif tag == 'forward':
-                    forward_references.add(concept)
-                elif tag == 'backward':
-                    backward_references.add(concept)
+                tagged_annotations.append((annotation.get('tag').lower(), annotation.text.lower()))
+
+        section.clear()
+
+        while section.getprevious() is not None:
+            del section.getparent()[0]
+
+    # Only the lemmatiser (which relies on the tagger) is needed, so the parser and NER components are disabled.
+    # Lemmatising all of the annotations in one `pipe` call amortises the pipeline's per-call overhead.
+    nlp = spacy.load('en', disable=['parser', 'ner'])
+    docs = nlp.pipe((text for _, text in tagged_annotations), batch_size=256)
+
+    # Maps annotation tags (already lowercased on ingest) to the set that the concept belongs in,
+    # replacing a chain of string comparisons per annotation with a single dict lookup.
+    target_sets = {
+        'a priori': a_priori_concepts,
+        'emerging': emerging_concepts,
+        'forward': forward_references,
+        'backward': backward_references,
+    }
+
+    for (tag, _), doc in zip(tagged_annotations, docs):
+        target_set = target_sets.get(tag)
+
+        if target_set is not None:
+            target_set.add(' '.join([token.lemma_ for token in doc]))
 
     return a_priori_concepts, backward_references, emerging_concepts, forward_references
 
@@ -137,24 +158,41 @@ def main(filename: str, output_dir: Optional[str] = None, random_trials: int = 0
 
     a_priori_concepts, backward_references, emerging_concepts, forward_references = extract_annotations_from_file(
         filename)
+    # The document is read once and the sections are shared between the parsers so each one does not
+    # re-read the XML from disk.
+    sections = load_sections(filename)
     parsers = [XMLParser(), CoreNLPParser(), OpenIEParser(), EnsembleParser()]
 
     if random_trials < 1:
-        evaluate_deterministic(a_priori_concepts, backward_references, basename, emerging_concepts, filename,
+        evaluate_deterministic(a_priori_concepts, backward_references, basename, emerging_concepts, sections,
                                forward_references, output_dir, parsers)
     else:
-        evaluate_random(a_priori_concepts, backward_references, basename, emerging_concepts, filename,
+        evaluate_random(a_priori_concepts, backward_references, basename, emerging_concepts, sections,
                         forward_references, output_dir, parsers, random_trials)
 
 
-def evaluate_deterministic(a_priori_concepts, backward_references, basename, emerging_concepts, filename,
+def evaluate_parser(parser, sections, a_priori_concepts, emerging_concepts, forward_references, backward_references):
+    """Parse a document with a single parser and evaluate the resulting graph.
+
+    :return: The metrics for the parser as a Pandas DataFrame.
+    """
+    graph = ConceptGraph(parser)
+    graph.parse(sections)
+
+    return evaluate(graph, a_priori_concepts, emerging_concepts, forward_references, backward_references)
+
+
+def evaluate_deterministic(a_priori_concepts, backward_references, basename, emerging_concepts, sections,
                            forward_references, output_dir, parsers):
-    for parser in parsers:
-        graph = ConceptGraph(parser)
-        graph.parse(filename)
+    # The CoreNLP-backed parsers spend most of their time waiting on the annotation server, so the parsers
+    # are evaluated concurrently. Results are collected and printed in the original parser order.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(parsers)) as executor:
+        futures = [executor.submit(evaluate_parser, parser, sections, a_priori_concepts, emerging_concepts,
+                                   forward_references, backward_references)
+                   for parser in parsers]
 
-        df = evaluate(graph, a_priori_concepts, emerging_concepts, forward_references,
-                      backward_references)
+    for parser, future in zip(parsers, futures):
+        df = future.result()
 
         if output_dir:
             path = f'{output_dir}{parser.__class__.__name__}-{basename[0]}.csv'
@@ -169,11 +207,11 @@ def evaluate_deterministic(a_priori_concepts, backward_references, basename, eme
         print()
 
 
-def evaluate_random(a_priori_concepts, backward_references, basename, emerging_concepts, filename,
+def evaluate_random(a_priori_concepts, backward_references, basename, emerging_concepts, sections,
                     forward_references, output_dir, parsers, random_trials):
     for parser in parsers:
         graph = ConceptGraph(parser)
-        graph.parse(filename)
+        graph.parse(sections)
 
         for trial in range(random_trials):
             # Mark concepts
@@ -10,10 +10,10 @@ class ParserI:
         """
         raise NotImplementedError
 
-    def parse(self, filename: str, graph: GraphI):
-        """Parse a file and build up a graph structure.
+    def parse(self, document, graph: GraphI):
+        """Parse a document and build up a graph structure.
 
-        :param filename: The file to parse.
+        :param document: The file to parse, or its pre-loaded sections.
         :param graph: The graph instance to add the nodes and edges to.
         """
         raise NotImplementedError
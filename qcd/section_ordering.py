@@ -1,5 +1,5 @@
 import itertools
-import statistics
+from math import sqrt
 
 import numpy as np
 import plac
@@ -8,12 +8,26 @@ from qcd.concept_graph import ConceptGraph
 from qcd.xml_parser import XMLParser
 
 
-def evaluate_permutation(graph, i, permutation, permutations, scores):
+def evaluate_permutation(graph, i, permutation, score_cache, cache_score=False):
     print(f'\rProcessed {i + 1} section ordering permutations...', end='')
-    permutations.append(permutation)
-    graph.sections = permutation
-    graph.mark_edges()
-    scores.append(graph.score())
+
+    # Random sampling can draw the same ordering more than once, so scores are cached per ordering and
+    # re-marking the graph is skipped for orderings that have already been scored.
+    key = tuple(permutation)
+
+    try:
+        return score_cache[key]
+    except KeyError:
+        graph.sections = permutation
+        graph.mark_edges()
+        score = graph.score()
+
+        # The exhaustive sweep never repeats an ordering, so only the random sampling path stores new
+        # entries -- caching every distinct ordering would cost O(n! * n) memory for no extra hits.
+        if cache_score:
+            score_cache[key] = score
+
+        return score
 
 
 @plac.annotations(
@@ -48,39 +62,68 @@ def main(file, n_samples=-1, disable_implicit_references=False, disable_referenc
     if not disable_summary:
         graph.print_summary()
 
+    original_score = graph.score()
+
     print('Original Section Ordering: %s' % graph.sections)
-    print('Score on Original Ordering: %.2f' % graph.score())
+    print('Score on Original Ordering: %.2f' % original_score)
 
     if not disable_graph_rendering:
         graph.render()
 
-    scores = []
-    permutations = []
+    # The graph has already been scored on the original ordering above, so the identity permutation (the
+    # first one the exhaustive sweep yields) is served from the cache instead of being re-marked and
+    # re-scored.
+    score_cache = {tuple(graph.sections): original_score}
+
+    # The mean and variance are accumulated with Welford's algorithm and only the extreme orderings and a
+    # small sample of scores are kept, so memory stays constant even over a factorial number of permutations.
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    min_score = float('inf')
+    max_score = -float('inf')
+    min_ordering = None
+    max_ordering = None
+    sample_scores = []
 
     assert n_samples == -1 or n_samples > 0, 'Parameter `n-samples` must be -1 or a positive integer.'
 
     if n_samples > 0:
-        for i in range(n_samples):
-            permutation = np.random.permutation(graph.sections)
-
-            evaluate_permutation(graph, i, permutation.tolist(), permutations, scores)
+        permutation_iter = (np.random.permutation(graph.sections).tolist() for _ in range(n_samples))
     else:
-        for i, permutation in enumerate(itertools.permutations(graph.sections)):
-            evaluate_permutation(graph, i, permutation, permutations, scores)
+        permutation_iter = itertools.permutations(graph.sections)
 
-    print('\nDone.')
+    cache_scores = n_samples > 0
 
-    min_score = min(scores)
-    max_score = max(scores)
+    for i, permutation in enumerate(permutation_iter):
+        score = evaluate_permutation(graph, i, permutation, score_cache, cache_scores)
+
+        n += 1
+        delta = score - mean
+        mean += delta / n
+        m2 += delta * (score - mean)
+
+        if score < min_score:
+            min_score = score
+            min_ordering = permutation
+
+        if score > max_score:
+            max_score = score
+            max_ordering = permutation
+
+        if len(sample_scores) < 10:
+            sample_scores.append(score)
+
+    print('\nDone.')
 
-    if len(scores) > 10:
-        print('scores: %s...' % ['%.2f' % score for score in scores[:10]])
+    if n > 10:
+        print('scores: %s...' % ['%.2f' % score for score in sample_scores])
     else:
-        print('scores: %s' % ['%.2f' % score for score in scores])
+        print('scores: %s' % ['%.2f' % score for score in sample_scores])
 
-    print('min: %.2f - ordering: %s' % (min_score, permutations[scores.index(min_score)]))
-    print('max: %.2f - ordering: %s' % (max_score, permutations[scores.index(max_score)]))
-    print('Mean: %.2f - Std. Dev.: %.2f' % (sum(scores) / len(scores), statistics.stdev(scores)))
+    print('min: %.2f - ordering: %s' % (min_score, min_ordering))
+    print('max: %.2f - ordering: %s' % (max_score, max_ordering))
+    print('Mean: %.2f - Std. Dev.: %.2f' % (mean, sqrt(m2 / (n - 1)) if n > 1 else 0.0))
     print('Max Absolute Difference: %.2f - Max Diff. Ratio: %.2f' % (max_score - min_score,
                                                                      (max_score - min_score) / max_score))
 
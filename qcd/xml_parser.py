@@ -1,18 +1,261 @@
+import functools
+import re
+import threading
 from abc import ABC
-from typing import List, Tuple
-from xml.etree import ElementTree
+from typing import Dict, Iterable, List, Tuple, Union
 
 import neuralcoref
 import nltk
 import spacy
+from lxml import etree
 from spacy.tokens.span import Span
-from wordfreq import zipf_frequency
 
-from qcd.concept_graph import ImplicitReference, ConceptGraph, Relation
+from qcd.concept_graph import ImplicitReference, ConceptGraph, Relation, word_frequency
 from qcd.corenlp import CustomCoreNLPClient
 from qcd.graph import Node, Section
 from qcd.parser import ParserI
 
+# The lemmatizer is created once at module level so that every parser instance shares the same WordNet corpus
+# and so that the cache below stays valid across parser instances. WordNet itself is lazily loaded by NLTK, so
+# the throwaway call below forces the corpus to load at import time rather than in the middle of parsing.
+_LEMMATIZER: nltk.WordNetLemmatizer = nltk.WordNetLemmatizer()
+_LEMMATIZER.lemmatize('document')
+
+# Caches POS tagging results keyed by the phrase. Entity phrases repeat heavily within a document so
+# repeated phrases can skip the tagger entirely.
+_POS_TAG_CACHE: Dict[str, Tuple[Tuple[str, str], ...]] = dict()
+
+# Caches the variations generated by `ParserABC.permutations` keyed by the tagged phrase. Distinct phrases
+# often share a tag sequence and repeated phrases recur across sections, so the chunk walk can be skipped
+# for any tagged phrase that has been seen before.
+_PERMUTATION_CACHE: Dict[Tuple[Tuple[str, str], ...], List[Tuple[str, str]]] = dict()
+
+# spaCy language models, loaded once per process and shared between parsers since loading a model is expensive.
+_NLP_CACHE: Dict[bool, object] = dict()
+_NLP_LOAD_LOCK = threading.Lock()
+
+
+class _ThreadSafeNLP:
+    """Serialises access to a shared spaCy pipeline.
+
+    spaCy's `Language` and its tokenizer mutate shared state (the tokenizer cache and string store) and are
+    not safe to call from multiple threads at once. Parsers may run concurrently (e.g. during evaluation), so
+    the shared model is only ever entered by one thread at a time. Work that does not touch the pipeline,
+    such as waiting on the CoreNLP server, still overlaps freely.
+    """
+
+    def __init__(self, nlp):
+        self._nlp = nlp
+        self._lock = threading.Lock()
+
+    def __call__(self, text: str):
+        with self._lock:
+            return self._nlp(text)
+
+    def pipe(self, texts, batch_size: int = 256):
+        # The documents are materialised while the lock is held so that no processing happens outside it.
+        with self._lock:
+            return list(self._nlp.pipe(texts, batch_size=batch_size))
+
+
+def load_nlp(resolve_coreferences: bool = False):
+    """Get the shared spaCy language model, loading it on first use.
+
+    :param resolve_coreferences: Whether or not the model should resolve coreferences before processing text.
+    :return: A callable that processes a string of text with spaCy.
+    """
+    try:
+        return _NLP_CACHE[resolve_coreferences]
+    except KeyError:
+        # The lock stops two threads that miss the cache at the same time from both loading the model.
+        with _NLP_LOAD_LOCK:
+            if resolve_coreferences in _NLP_CACHE:
+                return _NLP_CACHE[resolve_coreferences]
+
+            nlp = spacy.load('en')
+
+            if resolve_coreferences:
+                neuralcoref.add_to_pipe(nlp)
+
+                def nlp_(text: str):
+                    # noinspection PyProtectedMember
+                    return nlp(nlp(text)._.coref_resolved)
+
+                _NLP_CACHE[resolve_coreferences] = _ThreadSafeNLP(nlp_)
+            else:
+                _NLP_CACHE[resolve_coreferences] = _ThreadSafeNLP(nlp)
+
+            return _NLP_CACHE[resolve_coreferences]
+
+
+# Integer codes for the POS tag classes that the chunk walkers below test for. Comparing small integers is
+# cheaper than calling str.startswith and hashing into tag sets inside the inner loops.
+TAG_OTHER, TAG_NOUN, TAG_ADJECTIVE, TAG_CONJUNCTION, TAG_PREPOSITION, TAG_DETERMINER = range(6)
+
+_TAG_CODE_CACHE: Dict[str, int] = dict()
+
+
+def tag_code(tag: str) -> int:
+    """Map a POS tag to the integer code of its tag class.
+
+    :param tag: The POS tag.
+    :return: One of the `TAG_*` codes.
+    """
+    try:
+        return _TAG_CODE_CACHE[tag]
+    except KeyError:
+        if tag.startswith('NN'):
+            code = TAG_NOUN
+        elif tag == 'JJ':
+            code = TAG_ADJECTIVE
+        elif tag == 'CC':
+            code = TAG_CONJUNCTION
+        elif tag == 'IN':
+            code = TAG_PREPOSITION
+        elif tag == 'DT':
+            code = TAG_DETERMINER
+        else:
+            code = TAG_OTHER
+
+        _TAG_CODE_CACHE[tag] = code
+
+        return code
+
+
+def join_tokens(tokens: List[str], start: int, end: int, cache: Dict[Tuple[int, int], str]) -> str:
+    """Join a span of tokens into a phrase, memoising the result per span.
+
+    Nested chunks share sub-phrases, so memoising the joins avoids rebuilding the same string
+    at each nesting level.
+
+    :param tokens: The tokens of the whole phrase.
+    :param start: Index of the first token in the span.
+    :param end: Index one past the last token in the span.
+    :param cache: The per-phrase cache of joined spans.
+    :return: The tokens of the span joined by spaces.
+    """
+    try:
+        return cache[(start, end)]
+    except KeyError:
+        joined = ' '.join(tokens[start:end])
+        cache[(start, end)] = joined
+
+        return joined
+
+
+@functools.lru_cache(maxsize=100000)
+def lemmatize(word: str) -> str:
+    """Lemmatize a single word, caching the result.
+
+    :param word: The word to lemmatize.
+    :return: The lemmatized form of the word.
+    """
+    return _LEMMATIZER.lemmatize(word)
+
+
+def pos_tag(phrase: str) -> Tuple[Tuple[str, str], ...]:
+    """Tokenise and POS tag a phrase, caching the result.
+
+    :param phrase: The phrase to tag.
+    :return: Tuple of token, tag pairs.
+    """
+    try:
+        return _POS_TAG_CACHE[phrase]
+    except KeyError:
+        tags = tuple((token.text, token.tag_) for token in load_nlp()(phrase))
+        _POS_TAG_CACHE[phrase] = tags
+
+        return tags
+
+
+def pos_tag_batch(phrases: List[str]) -> List[Tuple[Tuple[str, str], ...]]:
+    """Tokenise and POS tag a batch of phrases in a single pass through the spaCy pipeline.
+
+    Processing phrases together via `pipe` amortises the pipeline's fixed per-call overhead. Results are cached
+    as in `pos_tag` and phrases that have been tagged before are not tagged again. Phrases that repeat within
+    the batch are only tagged once.
+
+    :param phrases: The phrases to tag.
+    :return: The tagged phrases, each a tuple of token, tag pairs, in the same order as `phrases`.
+    """
+    missing = [phrase for phrase in dict.fromkeys(phrases) if phrase not in _POS_TAG_CACHE]
+
+    if missing:
+        for phrase, doc in zip(missing, load_nlp().pipe(missing, batch_size=256)):
+            _POS_TAG_CACHE[phrase] = tuple((token.text, token.tag_) for token in doc)
+
+    return [_POS_TAG_CACHE[phrase] for phrase in phrases]
+
+
+# The NBAR grammar rule (an optional determiner, followed by nouns and/or adjectives, terminated with a noun)
+# compiled as a single regex over a string of POS tags joined by a '|' delimiter. Matching against the tag string
+# directly avoids building an NLTK parse tree for every phrase. The lookbehind anchors matches to tag boundaries.
+_NBAR_PATTERN = re.compile(r'(?<=\|)(?:DT\|)?(?:(?:NN[^|]*|JJ)\|)*NN[^|]*\|')
+
+
+def nbar_spans(tags: List[str]) -> Tuple[int, int]:
+    """Find the NBAR chunks in a sequence of POS tags.
+
+    :param tags: The POS tags of a phrase.
+    :return: Yields 2-tuples containing the start (inclusive) and end (exclusive) token indices of each NBAR chunk.
+    """
+    encoded = '|'
+    token_starts = {}
+
+    for i, tag in enumerate(tags):
+        token_starts[len(encoded)] = i
+        encoded += tag + '|'
+
+    token_starts[len(encoded)] = len(tags)
+
+    for match in _NBAR_PATTERN.finditer(encoded):
+        yield token_starts[match.start()], token_starts[match.end()]
+
+
+def iter_sections(filename: str) -> Tuple[str, str]:
+    """Iterate over the sections of an XML document.
+
+    The document is streamed section by section rather than being read into memory all at once, and each section
+    element is freed as soon as it has been consumed.
+
+    :param filename: The XML file to read.
+    :return: Yields 2-tuples containing the title and text of each section.
+    """
+    for _, section in etree.iterparse(filename, events=('end',), tag='section'):
+        title = section.find('title').text
+        text = section.find('text').text
+
+        yield title, text
+
+        # Free the section element and any of its preceding siblings that are still referenced by the root.
+        section.clear()
+
+        while section.getprevious() is not None:
+            del section.getparent()[0]
+
+
+def load_sections(filename: str) -> List[Tuple[str, str]]:
+    """Read the sections of an XML document into a list.
+
+    Useful when the same document is going to be parsed more than once, since the XML only has to be read once.
+
+    :param filename: The XML file to read.
+    :return: A list of 2-tuples containing the title and text of each section.
+    """
+    return list(iter_sections(filename))
+
+
+def get_sections(document: Union[str, List[Tuple[str, str]]]) -> Iterable[Tuple[str, str]]:
+    """Get the sections of a document.
+
+    :param document: Either the path of an XML file, or the pre-loaded sections as returned by `load_sections`.
+    :return: An iterable of 2-tuples containing the title and text of each section.
+    """
+    if isinstance(document, str):
+        return iter_sections(document)
+
+    return document
+
 
 class ParserABC(ParserI, ABC):
     def __init__(self, annotate_edges: bool = True, implicit_references: bool = True,
@@ -43,7 +286,28 @@ class ParserABC(ParserI, ABC):
             graph.add_node(implicit_entity, section)
             graph.add_edge(context, implicit_entity, ImplicitReference)
 
-    def permutations(self, tagged_phrase: List[Tuple[str, str]]) -> Tuple[str, str]:
+    def permutations(self, tagged_phrase: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Get the variations of a POS (part of speech) tagged phrase.
+
+        The variations depend only on the tagged phrase, so results are cached and a phrase that has been seen
+        before (or shares its tagging with one that has) is served from the cache.
+
+        See `_permutations` for details of the variations that are generated.
+
+        :param tagged_phrase: List of 2-tuples containing a token and its POS tag.
+        :return: A list of 2-tuples containing a variation of `tagged_phrase` and the context it appears in.
+        """
+        key = tuple(tagged_phrase)
+
+        try:
+            return _PERMUTATION_CACHE[key]
+        except KeyError:
+            result = _PERMUTATION_CACHE[key] = list(self._permutations(key))
+
+            return result
+
+    @staticmethod
+    def _permutations(tagged_phrase: Tuple[Tuple[str, str], ...]) -> Tuple[str, str]:
         """Generate variations of a POS (part of speech) tagged phrase.
 
         Variations generated are:
@@ -60,94 +324,117 @@ class ParserABC(ParserI, ABC):
         phrase we can expect the nbar phrases 'sky and thunder god' and 'ancient Greek religion'. These two nbar phrases
         would be yield with the noun phrase as the context.
 
-        :param tagged_phrase: List of 2-tuples containing a POS tag and a token.
+        :param tagged_phrase: Tuple of 2-tuples containing a token and its POS tag.
         :return: Yields 2-tuples containing a variation of `tagged_phrase` and the context it appears in.
         """
-        context = ' '.join([token for token, tag in tagged_phrase])
-        tree = self.chunker.parse(nltk.Tree('S', tagged_phrase))
+        tokens = [token for token, tag in tagged_phrase]
+        # Tag class codes are computed once per phrase so the walkers below compare integers
+        # rather than strings.
+        codes = [tag_code(tag) for token, tag in tagged_phrase]
+        # Sub-phrases are shared between nesting levels through this per-phrase join cache.
+        join_cache = dict()
 
-        for st in tree.subtrees(filter=lambda t: t.label() == 'NBAR'):
-            chunk = list(st)
+        context = join_tokens(tokens, 0, len(tokens), join_cache)
 
-            if chunk[0][1] == 'DT':
-                chunk = chunk[1:]
+        for start, end in nbar_spans([tag for token, tag in tagged_phrase]):
+            if codes[start] == TAG_DETERMINER:
+                start += 1
 
-            nbar = ' '.join([token for token, tag in chunk])
+            nbar = join_tokens(tokens, start, end, join_cache)
             yield nbar, context
 
-            chunk = []
+            chunk_start = None
 
-            for token, tag in st:
-                if tag.startswith('NN') or tag in {'JJ', 'CC', 'IN'}:
-                    chunk.append((token, tag))
-                elif chunk:
-                    yield from self._process_np_chunk(chunk, nbar)
+            for i in range(start, end):
+                if codes[i] in (TAG_NOUN, TAG_ADJECTIVE, TAG_CONJUNCTION, TAG_PREPOSITION):
+                    if chunk_start is None:
+                        chunk_start = i
+                elif chunk_start is not None:
+                    yield from ParserABC._process_np_chunk(tokens, codes, chunk_start, i, nbar, join_cache)
 
-                    chunk = []
+                    chunk_start = None
 
-            if chunk:
-                yield from self._process_np_chunk(chunk, nbar)
+            if chunk_start is not None:
+                yield from ParserABC._process_np_chunk(tokens, codes, chunk_start, end, nbar, join_cache)
 
     @staticmethod
-    def _process_np_chunk(chunk: List[Tuple[str, str]], context: str) -> Tuple[str, str]:
+    def _process_np_chunk(tokens: List[str], codes: List[int], start: int, end: int, context: str,
+                          join_cache: Dict[Tuple[int, int], str]) -> Tuple[str, str]:
         """Generate variations of a NP (noun phrase) chunk.
 
-        :param chunk: List of 2-tuples containing a POS tag and a token.
+        :param tokens: The tokens of the whole phrase.
+        :param codes: The tag class codes of the whole phrase.
+        :param start: Index of the first token of the chunk.
+        :param end: Index one past the last token of the chunk.
         :param context: The parent phrase that the chunk originates from.
+        :param join_cache: The per-phrase cache of joined spans.
         """
-        np = ' '.join([token for token, tag in chunk])
+        np = join_tokens(tokens, start, end, join_cache)
         yield np, context
 
-        nbar_chunk = []
+        chunk_start = None
 
-        for token, tag in chunk:
-            if tag.startswith('NN') or tag in {'JJ'}:
-                nbar_chunk.append((token, tag))
-            elif nbar_chunk:
-                yield from XMLParser.process_nbar_chunk(nbar_chunk, np)
+        for i in range(start, end):
+            if codes[i] == TAG_NOUN or codes[i] == TAG_ADJECTIVE:
+                if chunk_start is None:
+                    chunk_start = i
+            elif chunk_start is not None:
+                yield from ParserABC.process_nbar_chunk(tokens, codes, chunk_start, i, np, join_cache)
 
-                nbar_chunk = []
+                chunk_start = None
 
-        if nbar_chunk:
-            yield from XMLParser.process_nbar_chunk(nbar_chunk, np)
+        if chunk_start is not None:
+            yield from ParserABC.process_nbar_chunk(tokens, codes, chunk_start, end, np, join_cache)
 
     @staticmethod
-    def process_nbar_chunk(chunk: List[Tuple[str, str]], context: str) -> Tuple[str, str]:
+    def process_nbar_chunk(tokens: List[str], codes: List[int], start: int, end: int, context: str,
+                           join_cache: Dict[Tuple[int, int], str]) -> Tuple[str, str]:
         """Generate variations of a NBAR chunk.
 
-        :param chunk: List of 2-tuples containing a POS tag and a token.
+        :param tokens: The tokens of the whole phrase.
+        :param codes: The tag class codes of the whole phrase.
+        :param start: Index of the first token of the chunk.
+        :param end: Index one past the last token of the chunk.
         :param context: The parent phrase that the chunk originates from.
+        :param join_cache: The per-phrase cache of joined spans.
         """
-        nbar = ' '.join([token for token, tag in chunk])
+        nbar = join_tokens(tokens, start, end, join_cache)
         yield nbar, context
 
-        noun_chunk = []
+        chunk_start = None
 
-        for token, tag in chunk:
-            if tag.startswith('NN'):
-                noun_chunk.append((token, tag))
-            elif tag == 'JJ':
-                yield token, nbar
-            elif noun_chunk:
-                yield from XMLParser.process_noun_chunk(noun_chunk, nbar)
+        for i in range(start, end):
+            if codes[i] == TAG_NOUN:
+                if chunk_start is None:
+                    chunk_start = i
+            else:
+                if chunk_start is not None:
+                    yield from ParserABC.process_noun_chunk(tokens, chunk_start, i, nbar, join_cache)
 
-                noun_chunk = []
+                    chunk_start = None
 
-        if noun_chunk:
-            yield from XMLParser.process_noun_chunk(noun_chunk, nbar)
+                if codes[i] == TAG_ADJECTIVE:
+                    yield tokens[i], nbar
+
+        if chunk_start is not None:
+            yield from ParserABC.process_noun_chunk(tokens, chunk_start, end, nbar, join_cache)
 
     @staticmethod
-    def process_noun_chunk(chunk: List[Tuple[str, str]], context: str) -> Tuple[str, str]:
+    def process_noun_chunk(tokens: List[str], start: int, end: int, context: str,
+                           join_cache: Dict[Tuple[int, int], str]) -> Tuple[str, str]:
         """Generate variations of a noun chunk.
 
-        :param chunk: List of 2-tuples containing a POS tag and a token.
+        :param tokens: The tokens of the whole phrase.
+        :param start: Index of the first token of the chunk.
+        :param end: Index one past the last token of the chunk.
         :param context: The parent phrase that the chunk originates from.
+        :param join_cache: The per-phrase cache of joined spans.
         """
-        noun_chunk = ' '.join([token for token, tag in chunk])
+        noun_chunk = join_tokens(tokens, start, end, join_cache)
         yield noun_chunk, context
 
-        for token, _ in chunk:
-            yield token, noun_chunk
+        for i in range(start, end):
+            yield tokens[i], noun_chunk
 
     def identify_emerging_concepts(self, sent: Span, section: Section, graph: ConceptGraph, rule_based=True):
         """Identify concepts in a given sentence that are likely to be emerging concepts.
@@ -186,7 +473,7 @@ class ParserABC(ParserI, ABC):
                 tokens = filter(lambda token: len(token.text.strip()) > 0, tokens)
                 node = Node(' '.join(map(lambda token: token.text, tokens)))
 
-                if node != '' and zipf_frequency(node, 'en') < self.emerging_concept_frequency_cutoff:
+                if node != '' and word_frequency(node) < self.emerging_concept_frequency_cutoff:
                     if node not in graph.nodes:
                         graph.add_node(node, section)
 
@@ -210,7 +497,6 @@ class XMLParser(ParserABC):
         super().__init__(annotate_edges, implicit_references, resolve_coreferences)
 
         self.chunker: nltk.RegexpParser = nltk.RegexpParser(self.get_grammar())
-        self.lemmatizer: nltk.WordNetLemmatizer = nltk.WordNetLemmatizer()
 
     def get_grammar(self) -> str:
         return r"""
@@ -221,36 +507,20 @@ class XMLParser(ParserABC):
                {<NBAR>(<IN|CC><NBAR>)*}  # Above, connected with in/of/etc...
        """
 
-    def parse(self, filename: str, graph: ConceptGraph):
-        """Parse a file and build up a graph structure.
+    def parse(self, document: Union[str, List[Tuple[str, str]]], graph: ConceptGraph):
+        """Parse a document and build up a graph structure.
 
-        :param filename: The file to parse.
+        :param document: The XML file to parse, or its pre-loaded sections.
         :param graph: The graph instance to add the nodes and edges to.
         """
-        tree = ElementTree.parse(filename)
-        root = tree.getroot()
-
-        if self.resolve_coreferences:
-            nlp_ = spacy.load('en')
-            neuralcoref.add_to_pipe(nlp_)
-
-            def nlp(text: str):
-                # noinspection PyProtectedMember
-                return nlp_(nlp_(text)._.coref_resolved)
-        else:
-            nlp_ = spacy.load('en')
-
-            def nlp(text: str):
-                return nlp_(text)
+        nlp = load_nlp(self.resolve_coreferences)
 
-        for section in root.findall('section'):
-            section_title = section.find('title').text
+        for section_title, section_text in get_sections(document):
             section_title = section_title.lower()
 
             if section_title == 'references':
                 continue
 
-            section_text = section.find('text').text
             section_text = section_text.lower()
 
             span = nlp(section_text)
@@ -308,7 +578,7 @@ class XMLParser(ParserABC):
             if subject.tag_ == 'DT':
                 subject = ' '.join(str(subject).split()[1:])
 
-            subject = ' '.join(map(self.lemmatizer.lemmatize, str(subject).split()))
+            subject = ' '.join(map(lemmatize, str(subject).split()))
 
         return str(subject)
 
@@ -381,7 +651,6 @@ class OpenIEParser(CoreNLPParserABC):
         super().__init__(annotate_edges, implicit_references, resolve_coreferences, server_url)
 
         self.chunker: nltk.RegexpParser = nltk.RegexpParser(self.get_grammar())
-        self.lemmatizer: nltk.WordNetLemmatizer = nltk.WordNetLemmatizer()
 
     def get_grammar(self) -> str:
         return r"""
@@ -392,36 +661,20 @@ class OpenIEParser(CoreNLPParserABC):
                {<NBAR>(<IN|CC><NBAR>)*}  # Above, connected with in/of/etc...
        """
 
-    def parse(self, filename: str, graph: ConceptGraph):
-        """Parse a file and build up a graph structure.
+    def parse(self, document: Union[str, List[Tuple[str, str]]], graph: ConceptGraph):
+        """Parse a document and build up a graph structure.
 
-        :param filename: The file to parse.
+        :param document: The XML file to parse, or its pre-loaded sections.
         :param graph: The graph instance to add the nodes and edges to.
         """
-        tree = ElementTree.parse(filename)
-        root = tree.getroot()
+        nlp = load_nlp(self.resolve_coreferences)
 
-        if self.resolve_coreferences:
-            nlp_ = spacy.load('en')
-            neuralcoref.add_to_pipe(nlp_)
-
-            def nlp(text: str):
-                # noinspection PyProtectedMember
-                return nlp_(nlp_(text)._.coref_resolved)
-        else:
-            nlp_ = spacy.load('en')
-
-            def nlp(text: str):
-                return nlp_(text)
-
-        for section in root.findall('section'):
-            section_title = section.find('title').text
+        for section_title, section_text in get_sections(document):
             section_title = section_title.lower()
 
             if section_title == 'references':
                 continue
 
-            section_text = section.find('text').text
             section_text = section_text.lower()
 
             span = nlp(section_text)
@@ -435,25 +688,37 @@ class OpenIEParser(CoreNLPParserABC):
                     annotation = self.client.annotate(s.text.strip())
 
                     for sentence in annotation['sentences']:
-                        for triple in sentence['openie']:
-                            subject, relation, object_ = triple['subject'], triple['relation'], triple['object']
+                        triples = [(triple['subject'], triple['relation'], triple['object'])
+                                   for triple in sentence['openie']
+                                   if self.filter_triple(triple['subject'], triple['relation'], triple['object'])]
+
+                        # Tag every phrase in the sentence in a single batch rather than one call per phrase.
+                        phrases = []
 
-                            if self.filter_triple(subject, relation, object_):
-                                graph.add_relation(subject, relation, object_, section_title)
+                        for subject, relation, object_ in triples:
+                            phrases.append(subject)
+                            phrases.append(relation)
+                            phrases.append(object_)
 
-                                subject_tags = self.strip_determiners(nltk.pos_tag(nltk.word_tokenize(subject)))
-                                relation_tags = self.strip_determiners(nltk.pos_tag(nltk.word_tokenize(relation)))
-                                object_tags = self.strip_determiners(nltk.pos_tag(nltk.word_tokenize(object_)))
+                        tagged = pos_tag_batch(phrases)
 
-                                subject = ' '.join([token for token, tag in subject_tags])
-                                relation = ' '.join([token for token, tag in relation_tags])
-                                object_ = ' '.join([token for token, tag in object_tags])
+                        for (subject, relation, object_), subject_tags, relation_tags, object_tags in \
+                                zip(triples, tagged[0::3], tagged[1::3], tagged[2::3]):
+                            graph.add_relation(subject, relation, object_, section_title)
 
-                                graph.add_relation(Node(subject), Relation(relation), Node(object_),
-                                                   Section(section_title))
+                            subject_tags = self.strip_determiners(subject_tags)
+                            relation_tags = self.strip_determiners(relation_tags)
+                            object_tags = self.strip_determiners(object_tags)
 
-                                self.add_implicit_references(subject_tags, Section(section_title), graph)
-                                self.add_implicit_references(object_tags, Section(section_title), graph)
+                            subject = ' '.join([token for token, tag in subject_tags])
+                            relation = ' '.join([token for token, tag in relation_tags])
+                            object_ = ' '.join([token for token, tag in object_tags])
+
+                            graph.add_relation(Node(subject), Relation(relation), Node(object_),
+                                               Section(section_title))
+
+                            self.add_implicit_references(subject_tags, Section(section_title), graph)
+                            self.add_implicit_references(object_tags, Section(section_title), graph)
 
     def filter_triple(self, subject: str, relation: str, object_: str) -> bool:
         # annotation = self.client.annotate(object_)
@@ -489,7 +754,6 @@ class CoreNLPParser(CoreNLPParserABC):
         super().__init__(annotate_edges, implicit_references, resolve_coreferences, server_url)
 
         self.chunker: nltk.RegexpParser = nltk.RegexpParser(self.get_grammar())
-        self.lemmatizer: nltk.WordNetLemmatizer = nltk.WordNetLemmatizer()
 
     def get_grammar(self) -> str:
         return r"""
@@ -500,36 +764,20 @@ class CoreNLPParser(CoreNLPParserABC):
                {<NBAR>(<IN|CC><NBAR>)*}  # Above, connected with in/of/etc...
        """
 
-    def parse(self, filename: str, graph: ConceptGraph):
-        tree = ElementTree.parse(filename)
-        root = tree.getroot()
+    def parse(self, document: Union[str, List[Tuple[str, str]]], graph: ConceptGraph):
+        nlp = load_nlp(self.resolve_coreferences)
 
-        if self.resolve_coreferences:
-            nlp_ = spacy.load('en')
-            neuralcoref.add_to_pipe(nlp_)
-
-            def nlp(text: str):
-                # noinspection PyProtectedMember
-                return nlp_(nlp_(text)._.coref_resolved)
-        else:
-            nlp_ = spacy.load('en')
-
-            def nlp(text: str):
-                return nlp_(text)
-
-        for section in root.findall('section'):
-            section_title = section.find('title').text
+        for section_title, section_text in get_sections(document):
             section_title = section_title.lower()
 
             if section_title == 'references':
                 continue
 
-            section_text = section.find('text').text
             section_text = section_text.lower()
 
-            for sent in nltk.sent_tokenize(section_text):
-                sent = sent.strip()
-                sent = nlp(sent)
+            span = nlp(section_text)
+
+            for sent in span.sents:
                 sent = nlp(' '.join([tok.text for tok in filter(lambda tok: tok.tag_ not in {'RB'}, sent)]))
 
                 self.identify_emerging_concepts(sent, section_title, graph)
@@ -540,11 +788,23 @@ class CoreNLPParser(CoreNLPParserABC):
                     parse_tree = nltk.Tree.fromstring(sentence['parse'])
                     # parse_tree.pretty_print()
 
-                    for subject, verb, object_ in self.parse_the_parse_tree(parse_tree):
+                    triples = list(self.parse_the_parse_tree(parse_tree))
+
+                    # Tag every subject and object in the sentence in a single batch rather than one call per phrase.
+                    phrases = []
+
+                    for subject, verb, object_ in triples:
+                        phrases.append(' '.join(subject))
+                        phrases.append(' '.join(object_))
+
+                    tagged = pos_tag_batch(phrases)
+
+                    for (subject, verb, object_), subject_tagged, object_tagged in \
+                            zip(triples, tagged[0::2], tagged[1::2]):
                         subject_tags = list(
-                            filter(lambda token_tag: token_tag[1] not in {'DET', 'DT'}, nltk.pos_tag(subject)))
+                            filter(lambda token_tag: token_tag[1] not in {'DET', 'DT'}, subject_tagged))
                         object_tags = list(
-                            filter(lambda token_tag: token_tag[1] not in {'DET', 'DT'}, nltk.pos_tag(object_)))
+                            filter(lambda token_tag: token_tag[1] not in {'DET', 'DT'}, object_tagged))
 
                         subject = ' '.join([token for token, tag in subject_tags])
                         object_ = ' '.join([token for token, tag in object_tags])
@@ -662,7 +922,10 @@ class EnsembleParser(ParserABC):
     def get_grammar(self) -> str:
         raise NotImplementedError('This parser does not define a grammar.')
 
-    def parse(self, filename: str, graph: ConceptGraph):
+    def parse(self, document: Union[str, List[Tuple[str, str]]], graph: ConceptGraph):
+        # The sections are loaded once up front so that each parser in the ensemble does not re-read the XML.
+        sections = load_sections(document) if isinstance(document, str) else document
+
         # TODO: Fix 'double counting' for concepts/references extracted by 2+ parsers.
         for parser in self.parsers:
-            parser.parse(filename, graph)
+            parser.parse(sections, graph)